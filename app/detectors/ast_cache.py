@@ -0,0 +1,17 @@
+# app/detectors/ast_cache.py
+import ast
+import functools
+from typing import Optional
+
+@functools.lru_cache(maxsize=256)
+def parse_cached(code: str) -> Optional[ast.AST]:
+    """
+    ast.parse 결과를 소스 문자열 키로 메모이즈한다 (실패는 None으로 캐시 —
+    같은 소스는 다시 파싱해도 실패한다). 탐지기와 스타일/태깅 헬퍼가 같은
+    코드를 각자 파싱하는 중복을 제거하기 위한 공용 진입점.
+    주의: 반환된 트리는 캐시와 공유되므로 호출자는 트리를 수정하면 안 된다.
+    """
+    try:
+        return ast.parse(code)
+    except Exception:
+        return None
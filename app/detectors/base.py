@@ -1,5 +1,85 @@
 # app/detectors/base.py
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Set
+
+# 선택적 가속 백엔드: hyperscan이 설치되어 있으면 SIMD 멀티패턴 DFA로 스캔.
+# 없으면 아래 fused re 경로로 폴백한다.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# 패턴 선두의 리터럴 프리픽스 추출용 (\b 제거 후 식별자/:: 문자 연속)
+_LITERAL_PREFIX = re.compile(r"^(?:\\b)?([A-Za-z_][A-Za-z0-9_:]*)")
+_MIN_LITERAL_LEN = 4
+
+def required_literal(pattern) -> str | None:
+    """
+    Extract a literal substring that any match of the pattern must contain,
+    or None when no usable literal exists (e.g. the pattern starts with an
+    alternation). Used as a cheap str.__contains__ prefilter: substring
+    search runs at memmem speed, far faster than the regex engine.
+    """
+    src = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+    m = _LITERAL_PREFIX.match(src)
+    if m and len(m.group(1)) >= _MIN_LITERAL_LEN:
+        return m.group(1)
+    return None
+
+class RuleScanner:
+    """
+    Multi-pattern scanner over one code buffer.
+    Uses a hyperscan database (true multi-pattern DFA, one linear pass)
+    when the optional dependency is installed. Otherwise each rule is
+    gated by a literal-substring prefilter (see required_literal) and only
+    surviving rules run their own compiled regex, which keeps the \\b /
+    whitespace semantics the plain `in` check would lose.
+    scan(code) returns the set of pattern indices with at least one match.
+    """
+    def __init__(self, patterns, flags: int = 0):
+        self._ignorecase = bool(flags & re.IGNORECASE)
+        self._patterns = [
+            p if isinstance(p, re.Pattern) else re.compile(p, flags)
+            for p in patterns
+        ]
+        # 리터럴은 소문자 비교용으로 미리 내려둔다 (IGNORECASE 스캐너일 때)
+        self._literals = []
+        for p in self._patterns:
+            lit = required_literal(p)
+            if lit is not None and self._ignorecase:
+                lit = lit.lower()
+            self._literals.append(lit)
+        self._db = None
+        if hyperscan is not None:
+            try:
+                exprs = [
+                    (p.pattern if isinstance(p, re.Pattern) else p).encode("utf-8")
+                    for p in patterns
+                ]
+                hs_flags = hyperscan.HS_FLAG_SINGLEMATCH
+                if flags & re.IGNORECASE:
+                    hs_flags |= hyperscan.HS_FLAG_CASELESS
+                db = hyperscan.Database()
+                db.compile(expressions=exprs, ids=list(range(len(exprs))),
+                           flags=[hs_flags] * len(exprs))
+                self._db = db
+            except Exception:
+                # 일부 패턴이 hyperscan 문법을 벗어나면 re 경로 유지
+                self._db = None
+
+    def scan(self, code: str) -> Set[int]:
+        if self._db is not None:
+            hits: Set[int] = set()
+            self._db.scan(code.encode("utf-8", "replace"),
+                          match_event_handler=lambda rid, s, e, f, ctx: hits.add(rid))
+            return hits
+        # 리터럴 프리필터: 요구 리터럴이 아예 없는 코드면 regex 엔진을 건드리지 않음
+        haystack = code.lower() if self._ignorecase else code
+        return {
+            i
+            for i, lit in enumerate(self._literals)
+            if (lit is None or lit in haystack) and self._patterns[i].search(code)
+        }
 
 def make_result(score: int, reasons: List[str] | None = None,
                 blocked: List[str] | None = None, style: Dict[str, Any] | None = None,
@@ -15,3 +95,49 @@ def make_result(score: int, reasons: List[str] | None = None,
         "style": style or {},
         "hard_block": bool(hard_block),
     }
+
+def make_result_fast(score: int, reasons: List[str], blocked: List[str],
+                     style: Dict[str, Any] | None = None,
+                     hard_block: bool = False) -> Dict[str, Any]:
+    """
+    make_result without the 0..100 clamp, for internal callers that already
+    guarantee the bound (rule points are non-negative; callers pre-clamp with
+    min(score, 100)). External/uncertain callers should keep make_result.
+    """
+    return {
+        "score": score,
+        "reasons": reasons,
+        "blocked": blocked,
+        "style": style or {},
+        "hard_block": hard_block,
+    }
+
+_BATCH_PARALLEL_MIN = 32
+
+def analyze_batch(analyze_one, codes: List[str]) -> List[Dict[str, Any]]:
+    """
+    Run one analyze function over a list of snippets.
+    Small batches use a plain loop (thread dispatch would cost more than it
+    saves); larger ones fan out on a thread pool, which pays off when the
+    hyperscan backend (which releases the GIL while scanning) is active and
+    amortizes per-call Python overhead either way via the lru_cache layer.
+    """
+    if len(codes) >= _BATCH_PARALLEL_MIN:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor() as ex:
+            return list(ex.map(analyze_one, codes))
+    return [analyze_one(code) for code in codes]
+
+def copy_result(res: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shallow-copy a detector result dict. lru_cache-d analyze functions
+    return the same object on every hit; callers get a fresh copy so
+    mutation cannot poison the cache.
+    """
+    return {
+        "score": res["score"],
+        "reasons": list(res["reasons"]),
+        "blocked": list(res["blocked"]),
+        "style": dict(res["style"]),
+        "hard_block": res["hard_block"],
+    }
@@ -1,23 +1,27 @@
 # app/detectors/cpp_rules.py
-import re
-from typing import Dict, Any
-from app.detectors.base import make_result
+import functools
+from typing import Dict, Any, List
+from app.detectors.base import make_result_fast, copy_result, analyze_batch
+from app.detectors.rules_registry import scan_rules
 from app.detectors.resource_utils import run_all_resource_checks
 
-CPP_FORBIDDEN = [
-    (r"\bsystem\s*\(", 35, "system() 호출"),
-    (r"\bpopen\s*\(", 35, "popen() 호출"),
-    (r"\bstd::thread\b", 12, "std::thread 사용 (스레드)"),
-    (r"\bmalloc\s*\(", 20, "malloc 호출"),
-]
+@functools.lru_cache(maxsize=1024)
+def _analyze_cpp_cached(code: str) -> Dict[str, Any]:
+    score = 0; reasons = []; blocked = {}  # dict = 삽입순 집합 (중복 즉시 제거)
+    # C++ 규칙은 rules_registry의 공유 마스터 스캐너로 검사한다
+    for rule in scan_rules(code, "cpp"):
+        score += rule.pts; reasons.append(rule.msg)
+        if rule.blocked_tag:
+            blocked[rule.blocked_tag] = None
+    r_score, r_reasons, r_blocked = run_all_resource_checks(code)
+    score += r_score; reasons.extend(r_reasons); blocked.update(dict.fromkeys(r_blocked))
+    # 점수는 양수 합산이므로 상한만 당겨서 클램프하고 빠른 경로 사용
+    return make_result_fast(min(score, 100), reasons, sorted(blocked))
 
 def analyze_cpp(code: str) -> Dict[str, Any]:
-    score = 0; reasons = []; blocked = []
-    for pat, pts, msg in CPP_FORBIDDEN:
-        if re.search(pat, code, flags=re.IGNORECASE):
-            score += pts; reasons.append(msg)
-            if "system" in msg.lower():
-                blocked.append("no-system-call")
-    r_score, r_reasons, r_blocked = run_all_resource_checks(code)
-    score += r_score; reasons.extend(r_reasons); blocked.extend(r_blocked)
-    return make_result(score, reasons, list(sorted(set(blocked))))
+    # 순수 함수이므로 동일 스니펫 재분석은 캐시 복사본으로 즉시 반환
+    return copy_result(_analyze_cpp_cached(code))
+
+def analyze_cpp_batch(codes: List[str]) -> List[Dict[str, Any]]:
+    # 스니펫 목록을 한 번에 분석 (규모가 크면 base.analyze_batch가 병렬화)
+    return analyze_batch(analyze_cpp, codes)
@@ -1,14 +1,20 @@
-import re
-from app.detectors.base import make_result
+import functools
+from app.detectors.base import make_result_fast, copy_result, analyze_batch
+from app.detectors.rules_registry import scan_rules
 
-GENERIC_FORBIDDEN = [
-    (r"\b(eval|exec)\b", 30, "동적 코드 실행"),
-    (r"\b(fork|system\()\b", 25, "프로세스 제어"),
-]
+@functools.lru_cache(maxsize=1024)
+def _analyze_generic_cached(code: str):
+    score, reasons = 0, []
+    # 언어 불문 규칙도 rules_registry의 공유 마스터 스캐너로 검사한다
+    for rule in scan_rules(code, "generic"):
+        score += rule.pts; reasons.append(rule.msg)
+    # 점수는 양수 합산이므로 상한만 당겨서 클램프하고 빠른 경로 사용
+    return make_result_fast(min(score, 100), reasons, [])
 
 def analyze_generic(code: str):
-    score, reasons = 0, []
-    for pattern, pts, msg in GENERIC_FORBIDDEN:
-        if re.search(pattern, code, flags=re.MULTILINE):
-            score += pts; reasons.append(msg)
-    return make_result(score, reasons)
+    # 순수 함수이므로 동일 스니펫 재분석은 캐시 복사본으로 즉시 반환
+    return copy_result(_analyze_generic_cached(code))
+
+def analyze_generic_batch(codes):
+    # 스니펫 목록을 한 번에 분석 (규모가 크면 base.analyze_batch가 병렬화)
+    return analyze_batch(analyze_generic, codes)
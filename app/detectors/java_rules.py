@@ -0,0 +1,27 @@
+# app/detectors/java_rules.py
+import functools
+from typing import Dict, Any, List
+from app.detectors.base import make_result_fast, copy_result, analyze_batch
+from app.detectors.rules_registry import scan_rules
+from app.detectors.resource_utils import run_all_resource_checks
+
+@functools.lru_cache(maxsize=1024)
+def _analyze_java_cached(code: str) -> Dict[str, Any]:
+    score = 0; reasons = []; blocked = {}  # dict = 삽입순 집합 (중복 즉시 제거)
+    # Java 규칙은 rules_registry의 공유 마스터 스캐너로 검사한다
+    for rule in scan_rules(code, "java"):
+        score += rule.pts; reasons.append(rule.msg)
+        if rule.blocked_tag:
+            blocked[rule.blocked_tag] = None
+    r_score, r_reasons, r_blocked = run_all_resource_checks(code)
+    score += r_score; reasons.extend(r_reasons); blocked.update(dict.fromkeys(r_blocked))
+    # 점수는 양수 합산이므로 상한만 당겨서 클램프하고 빠른 경로 사용
+    return make_result_fast(min(score, 100), reasons, sorted(blocked))
+
+def analyze_java(code: str) -> Dict[str, Any]:
+    # 순수 함수이므로 동일 스니펫 재분석은 캐시 복사본으로 즉시 반환
+    return copy_result(_analyze_java_cached(code))
+
+def analyze_java_batch(codes: List[str]) -> List[Dict[str, Any]]:
+    # 스니펫 목록을 한 번에 분석 (규모가 크면 base.analyze_batch가 병렬화)
+    return analyze_batch(analyze_java, codes)
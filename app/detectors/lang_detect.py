@@ -1,3 +1,12 @@
+import functools
+
+# 선택적 가속: pyahocorasick이 있으면 모든 needle을 하나의 DFA로 만들어
+# 샘플을 한 번만 훑는다. 없으면 기존 (언어 × needle) 선형 스캔으로 폴백.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 LANG_HINTS = {
     "python": ["def ", "import ", "lambda ", "async def", "print("],
     "javascript": ["function ", "=>", "console.log", "export ", "import "],
@@ -8,10 +17,30 @@ LANG_HINTS = {
     "kotlin": ["fun main(", "val ", "var "],
 }
 
+# LANG_HINTS 삽입 순서 = 판정 우선순위 (기존 선형 스캔과 동일한 결과 보장)
+_LANG_ORDER = {lang: i for i, lang in enumerate(LANG_HINTS)}
+
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _lang, _needles in LANG_HINTS.items():
+        for _needle in _needles:
+            # 중복 needle("import " 등)은 먼저 등록된 언어가 우선
+            if _needle not in _AUTOMATON:
+                _AUTOMATON.add_word(_needle, _lang)
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+@functools.lru_cache(maxsize=1024)
 def detect_language(code: str, hint: str = "auto") -> str:
     if hint and hint != "auto":
         return hint.lower()
     sample = code[:2000]
+    if _AUTOMATON is not None:
+        found = {lang for _, lang in _AUTOMATON.iter(sample)}
+        if found:
+            return min(found, key=_LANG_ORDER.__getitem__)
+        return "python"
     for lang, needles in LANG_HINTS.items():
         if any(n in sample for n in needles):
             return lang
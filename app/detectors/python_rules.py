@@ -1,105 +1,159 @@
 # app/detectors/python_rules.py
+import functools
 import re
 import ast
 from typing import Dict, Any, List
-from app.detectors.base import make_result
-from app.utils import comment_ratio, avg_function_len_python
+from app.detectors.base import make_result_fast, copy_result, analyze_batch
+from app.detectors.ast_cache import parse_cached
+from app.utils import comment_ratio_np, avg_function_len_python
 
-# 기존 규칙 유지 + 설명
+# 기존 규칙 유지 + 설명 (모듈 임포트 시 한 번만 컴파일)
 GENERIC_FORBIDDEN = [
-    (r"\b(eval|exec)\b", 35, "동적 코드 실행"),
-    (r"\b(subprocess|Popen|system\()\b", 30, "프로세스 실행"),
-    (r"\b(socket\.|requests\.|httpx\.)", 10, "네트워크 접근"),
-    (r"while\s*True\s*:", 10, "무한루프 의심(정적 패턴)"),
-    (r"\bos\.fork\b", 40, "포크 폭탄 위험"),
-    (r"__import__\(", 25, "우회 임포트"),
-    (r"\b(ctypes\.|cffi\.)", 25, "네이티브 호출"),
+    (re.compile(r"\b(eval|exec)\b"), 35, "동적 코드 실행"),
+    (re.compile(r"\b(subprocess|Popen|system\()\b"), 30, "프로세스 실행"),
+    (re.compile(r"\b(socket\.|requests\.|httpx\.)"), 10, "네트워크 접근"),
+    (re.compile(r"while\s*True\s*:"), 10, "무한루프 의심(정적 패턴)"),
+    (re.compile(r"\bos\.fork\b"), 40, "포크 폭탄 위험"),
+    (re.compile(r"__import__\("), 25, "우회 임포트"),
+    (re.compile(r"\b(ctypes\.|cffi\.)"), 25, "네이티브 호출"),
 ]
 
+# 무한루프 정적 패턴도 미리 컴파일
+_INFINITE_WHILE = re.compile(r"\bwhile\s+(True|1)\s*:")
+
+# AST 파싱 게이트: 아래 토큰이 하나도 없으면 위험 구문이 있을 수 없으므로
+# ast.parse(토크나이즈+파싱 전체)를 건너뛴다. 파싱 자체는 길이 상한으로 제한.
+_PY_AST_TRIGGERS = re.compile(
+    r"\b(while|for|def|class|import|from|eval|exec|iter|count|fork|subprocess|ctypes|cffi|__import__)\b"
+)
+_AST_PARSE_CAP = 65536
+
 PY_FORBIDDEN_IMPORTS = {
     "subprocess": 35, "socket": 12, "os": 8, "sys": 6, "multiprocessing": 14,
     "threading": 8, "httpx": 8, "requests": 8, "ctypes": 25
 }
 
+class _PyRuleVisitor(ast.NodeVisitor):
+    """
+    단일 패스 AST 방문자. ast.walk + isinstance 체인 대신 CPython 방문자
+    디스패치(dict 조회)로 노드별 검사를 수행한다.
+    노드당 파이썬 오버헤드를 줄이기 위해 __slots__와 모듈 상수 바인딩을 사용.
+    """
+
+    __slots__ = ("score", "reasons", "blocked", "hard_block")
+
+    # 클래스 수준에 바인딩해 방문마다 모듈 전역 조회를 피한다
+    _forbidden_pts = staticmethod(PY_FORBIDDEN_IMPORTS.get)
+
+    def __init__(self):
+        self.score = 0
+        self.reasons: List[str] = []
+        self.blocked: List[str] = []
+        self.hard_block = False
+
+    def _check_import_names(self, names):
+        pts_of = self._forbidden_pts
+        for alias in names:
+            mod = alias.name.split(".", 1)[0]
+            pts = pts_of(mod)
+            if pts is not None:
+                self.score += pts
+                self.reasons.append(f"위험 모듈: {mod}")
+                self.blocked.append(f"no-{mod}")
+
+    def visit_Import(self, node):
+        self._check_import_names(node.names)
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        self._check_import_names(node.names)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        fn = None
+        # 여러 형태의 call.func 추출
+        if isinstance(node.func, ast.Name):
+            fn = node.func.id
+        elif isinstance(node.func, ast.Attribute):
+            fn = node.func.attr
+        if fn in {"eval", "exec"}:
+            self.score += 30
+            self.reasons.append(f"동적 실행 함수: {fn}")
+            self.blocked.append(f"no-{fn}")
+        self.generic_visit(node)
+
+    def visit_While(self, node):
+        # AST 수준 무한루프 감지 (조건이 constant True)
+        cond = node.test
+        if isinstance(cond, ast.Constant) and cond.value is True:
+            self.reasons.append("무한루프(AST 조건 감지)")
+            self.blocked.append("infinite-loop")
+            self.score += 80
+            self.hard_block = True
+        self.generic_visit(node)
+
+
 # 추가: 무한루프에 대하여는 하드블록 처리(우회가능성은 있지만 우선 안전 우선)
-def analyze_python(code: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=1024)
+def _analyze_python_cached(code: str) -> Dict[str, Any]:
     score = 0
     reasons: List[str] = []
-    blocked: List[str] = []
+    blocked: Dict[str, None] = {}  # dict = 삽입순 집합 (중복 즉시 제거)
     hard_block = False
 
-    # 1) 정적(텍스트) 패턴: while True / while 1 등
-    if re.search(r"\bwhile\s+(True|1)\s*:", code):
-        reasons.append("무한루프(정적 패턴)")
-        blocked.append("infinite-loop")
-        score += 80
-        hard_block = True
+    # 1) 정적(텍스트) 패턴: while True / while 1 등.
+    #    어차피 호출자가 차단하므로 나머지 regex/AST 분석은 낭비 — 즉시 반환
+    if _INFINITE_WHILE.search(code):
+        return make_result_fast(100, ["무한루프(정적 패턴)"], ["infinite-loop"], {}, hard_block=True)
 
     # 2) 기존 generic regex 탐지
     for pattern, pts, msg in GENERIC_FORBIDDEN:
-        if re.search(pattern, code, flags=re.MULTILINE):
+        if pattern.search(code):
             # 이미 무한루프 하드블록이면 추가 점수는 필요 없음, 다만 이유/blocked 채우기
             if "무한루프" not in msg:
                 reasons.append(msg)
-                blocked.append(msg)
+                blocked[msg] = None
                 score += pts
 
-    # 3) AST 기반 정밀 탐지 (if possible)
-    try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            # imports -> 위험 모듈 점수
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                for alias in node.names:
-                    mod = alias.name.split(".")[0]
-                    if mod in PY_FORBIDDEN_IMPORTS:
-                        pts = PY_FORBIDDEN_IMPORTS[mod]
-                        score += pts
-                        reasons.append(f"위험 모듈: {mod}")
-                        blocked.append(f"no-{mod}")
-
-            # call에서 eval/exec 탐지
-            elif isinstance(node, ast.Call):
-                fn = None
-                # 여러 형태의 call.func 추출
-                if isinstance(node.func, ast.Name):
-                    fn = node.func.id
-                elif isinstance(node.func, ast.Attribute):
-                    fn = node.func.attr
-                if fn in {"eval", "exec"}:
-                    score += 30
-                    reasons.append(f"동적 실행 함수: {fn}")
-                    blocked.append(f"no-{fn}")
-
-            # AST 수준 무한루프 감지 (조건이 constant True)
-            elif isinstance(node, ast.While):
-                cond = node.test
-                # Python3.8+ ast.Constant
-                is_const_true = False
-                if isinstance(cond, ast.Constant) and cond.value is True:
-                    is_const_true = True
-                # older ast.NameConstant
-                elif getattr(ast, "NameConstant", None) and isinstance(cond, ast.NameConstant) and cond.value is True:
-                    is_const_true = True
-                if is_const_true:
-                    reasons.append("무한루프(AST 조건 감지)")
-                    blocked.append("infinite-loop")
-                    score += 80
-                    hard_block = True
-
-    except Exception:
-        # AST 파싱 실패는 의심스럽게 처리
-        score += 20
-        reasons.append("AST 파싱 실패")
-
-        # keep tree = None for style calculation
-        tree = None
+    # 3) AST 기반 정밀 탐지 (if possible) — 방문자 1패스.
+    #    트리거 토큰이 전혀 없는 입력은 파싱을 생략 (benign 단문 최적화)
+    tree = None
+    if _PY_AST_TRIGGERS.search(code):
+        src = code
+        truncated = len(src) > _AST_PARSE_CAP
+        if truncated:
+            # 글자 수로 그대로 자르면 거의 항상 토큰 중간이 잘려 유효한 소스도
+            # SyntaxError가 된다 — 상한 직전의 마지막 개행에서 자른다
+            src = src[:_AST_PARSE_CAP].rsplit("\n", 1)[0]
+        # 공용 파스 캐시: 스타일/태깅 헬퍼와 동일 소스의 파스를 공유
+        tree = parse_cached(src)
+        if tree is not None:
+            visitor = _PyRuleVisitor()
+            visitor.visit(tree)
+            score += visitor.score
+            reasons.extend(visitor.reasons)
+            blocked.update(dict.fromkeys(visitor.blocked))
+            hard_block = hard_block or visitor.hard_block
+        elif not truncated:
+            # AST 파싱 실패는 의심스럽게 처리 (tree는 None 유지 → style 계산 생략).
+            # 단, 우리가 상한으로 잘라낸 입력은 잘림 자체가 실패 원인일 수 있으므로
+            # 의심 점수를 주지 않는다 (정상 파일에 누명 방지)
+            score += 20
+            reasons.append("AST 파싱 실패")
 
     # style metrics
     style = {
-        "comment_ratio": round(comment_ratio(code), 3),
+        "comment_ratio": round(comment_ratio_np(code), 3),
         "avg_function_length": round(avg_function_len_python(tree) if tree else 0.0, 1),
     }
 
-    # clamp & return with hard_block flag
-    return make_result(score, reasons, list(sorted(set(blocked))), style, hard_block=hard_block)
+    # 점수는 양수 합산이므로 상한만 당겨서 클램프하고 빠른 경로 사용
+    return make_result_fast(min(score, 100), reasons, sorted(blocked), style, hard_block=hard_block)
+
+def analyze_python(code: str) -> Dict[str, Any]:
+    # 순수 함수이므로 동일 스니펫 재분석은 캐시 복사본으로 즉시 반환
+    return copy_result(_analyze_python_cached(code))
+
+def analyze_python_batch(codes: List[str]) -> List[Dict[str, Any]]:
+    # 스니펫 목록을 한 번에 분석 (규모가 크면 base.analyze_batch가 병렬화)
+    return analyze_batch(analyze_python, codes)
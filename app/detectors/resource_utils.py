@@ -1,71 +1,127 @@
 # app/detectors/resource_utils.py
+import functools
 import re
 from typing import Tuple, List
 
+from app.detectors.base import RuleScanner
+
+# 모든 패턴은 모듈 임포트 시 한 번만 컴파일한다 (호출마다 re._compile 조회 제거).
 # 무한루프/루프 관련 패턴
 INFINITE_LOOP_PATTERNS = [
-    r"\bwhile\s*\(\s*1\s*\)",            # C/C++/Java: while(1)
-    r"\bfor\s*\(\s*;\s*;\s*\)",          # C/C++/Java: for(;;)
-    r"\bwhile\s+True\s*:",               # Python: while True:
-    r"\bdo\s*\{[\s\S]*?\}\s*while\s*\(1\)", # do{ } while(1)
+    re.compile(r"\bwhile\s*\(\s*1\s*\)", re.IGNORECASE),            # C/C++/Java: while(1)
+    re.compile(r"\bfor\s*\(\s*;\s*;\s*\)", re.IGNORECASE),          # C/C++/Java: for(;;)
+    re.compile(r"\bwhile\s+True\s*:", re.IGNORECASE),               # Python: while True:
+    re.compile(r"\bdo\s*\{[\s\S]*?\}\s*while\s*\(1\)", re.IGNORECASE), # do{ } while(1)
 ]
 
 # 대량할당 패턴 (거친 추정: 숫자 1,000,000 이상 등)
 LARGE_ALLOC_PATTERNS = [
-    r"\bmalloc\s*\(\s*([0-9]{6,})\s*\)",
-    r"\bcalloc\s*\(\s*([0-9]{6,})\s*,",
-    r"new\s+[a-zA-Z_0-9:<>]+\s*\[\s*([0-9]{6,})\s*\]",
-    r"\bstd::vector<[^>]+>\s*\w+\s*\(\s*([0-9]{6,})\s*\)",
-    r"\b(np|numpy)\.(zeros|ones|empty)\s*\(\s*\(?\s*([0-9]{4,})",
-    r"\bbytearray\s*\(\s*([0-9]{6,})\s*\)",
+    re.compile(r"\bmalloc\s*\(\s*([0-9]{6,})\s*\)", re.IGNORECASE),
+    re.compile(r"\bcalloc\s*\(\s*([0-9]{6,})\s*,", re.IGNORECASE),
+    re.compile(r"new\s+[a-zA-Z_0-9:<>]+\s*\[\s*([0-9]{6,})\s*\]", re.IGNORECASE),
+    re.compile(r"\bstd::vector<[^>]+>\s*\w+\s*\(\s*([0-9]{6,})\s*\)", re.IGNORECASE),
+    re.compile(r"\b(np|numpy)\.(zeros|ones|empty)\s*\(\s*\(?\s*([0-9]{4,})", re.IGNORECASE),
+    re.compile(r"\bbytearray\s*\(\s*([0-9]{6,})\s*\)", re.IGNORECASE),
 ]
 
-# 반복문 내부의 I/O 패턴 (파일/네트워크 반복)
-IO_IN_LOOP_SNIPPET = r"(while|for)[\s\S]{0,600}?(read|fread|fgets|fscanf|write|send|recv|readline|readlines|readinto|fs\.write|fs\.writeFile|writeFileSync|writeFile)\s*\("
+# 선택적 백엔드: 서드파티 regex 모듈이 있으면 백트래킹이 위험한 패턴에 쓴다
+# (복잡한 패턴에서 더 빠르고, 원자 그룹 지원이 오래됨). 없으면 표준 re —
+# 3.11+의 re도 (?>...) 원자 그룹을 지원하므로 패턴 소스는 공유한다.
+try:
+    import regex as _regex_backend
+except ImportError:
+    _regex_backend = re
+
+# 반복문 내부의 I/O 패턴 (파일/네트워크 반복).
+# 선두 루프 키워드를 원자 그룹으로 고정해 실패 시 대안 재시도 백트래킹을 차단.
+# 가운데 [\s\S]{0,600}?는 lazy 유지 — possessive로 바꾸면 매치 자체가 깨진다.
+IO_IN_LOOP_SNIPPET = _regex_backend.compile(
+    r"(?>while|for)[\s\S]{0,600}?(read|fread|fgets|fscanf|write|send|recv|readline|readlines|readinto|fs\.write|fs\.writeFile|writeFileSync|writeFile)\s*\(",
+    re.IGNORECASE,
+)
 
 # 프로세스/스레드/외부명령
 PROCESS_THREAD_PATTERNS = [
-    r"\bfork\s*\(",
-    r"\bexec(v|ve|vp|vpe)?\s*\(",
-    r"\bsystem\s*\(",
-    r"\bThread\s*\(",
-    r"\bstd::thread\b",
-    r"child_process\.(exec|spawn|fork|execSync|spawnSync)",
-    r"Runtime\.getRuntime\(\)\.exec\s*\(",
-    r"new\s+ProcessBuilder\s*\(",
-    r"\bsubprocess\.(Popen|call|run|check_output)\s*\(",
+    re.compile(r"\bfork\s*\(", re.IGNORECASE),
+    re.compile(r"\bexec(v|ve|vp|vpe)?\s*\(", re.IGNORECASE),
+    re.compile(r"\bsystem\s*\(", re.IGNORECASE),
+    re.compile(r"\bThread\s*\(", re.IGNORECASE),
+    re.compile(r"\bstd::thread\b", re.IGNORECASE),
+    re.compile(r"child_process\.(exec|spawn|fork|execSync|spawnSync)", re.IGNORECASE),
+    re.compile(r"Runtime\.getRuntime\(\)\.exec\s*\(", re.IGNORECASE),
+    re.compile(r"new\s+ProcessBuilder\s*\(", re.IGNORECASE),
+    re.compile(r"\bsubprocess\.(Popen|call|run|check_output)\s*\(", re.IGNORECASE),
 ]
 
 # 파일 쓰기/삭제/이동 등 위험 패턴
 FILE_WRITE_PATTERNS = [
-    r"\bfopen\s*\([^\)]*['\"]w['\"]",
-    r"\bofstream\b",
-    r"\bopen\([^,]+,[^)]*['\"]w['\"]",
-    r"\bfs\.(writeFile|writeFileSync|appendFile|unlink|rm)\b",
-    r"\bFiles\.(write|delete|move)\b",
-    r"\bopen\([^,]+,[^)]*['\"]wb['\"]",
+    re.compile(r"\bfopen\s*\([^\)]*['\"]w['\"]", re.IGNORECASE),
+    re.compile(r"\bofstream\b", re.IGNORECASE),
+    re.compile(r"\bopen\([^,]+,[^)]*['\"]w['\"]", re.IGNORECASE),
+    re.compile(r"\bfs\.(writeFile|writeFileSync|appendFile|unlink|rm)\b", re.IGNORECASE),
+    re.compile(r"\bFiles\.(write|delete|move)\b", re.IGNORECASE),
+    re.compile(r"\bopen\([^,]+,[^)]*['\"]wb['\"]", re.IGNORECASE),
 ]
 
 # 간단한 재귀 탐지 (파이썬용 heuristic)
-RECURSION_SNIPPET = r"def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(.*\):[\s\S]{0,400}\1\s*\("
+RECURSION_SNIPPET = re.compile(r"def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(.*\):[\s\S]{0,400}\1\s*\(")
+
+# boolean 판정만 필요한 리스트는 alternation 하나로 융합해 1패스로 스캔한다.
+# (LARGE_ALLOC_PATTERNS는 자리수 캡처 그룹이 필요해 패턴별 검사 유지)
+# do{}while 패턴(il3)은 스팬이 길어 while(1) 매치를 가리므로 융합에서 제외
+_INFINITE_LOOP_SCANNER = RuleScanner(INFINITE_LOOP_PATTERNS[:3], re.IGNORECASE)
+_PROC_THREAD_SCANNER = RuleScanner(PROCESS_THREAD_PATTERNS, re.IGNORECASE)
+_FILE_WRITE_SCANNER = RuleScanner(FILE_WRITE_PATTERNS, re.IGNORECASE)
+
+# detect_*/run_all 내부에서 쓰는 보조 패턴들도 미리 컴파일
+_LOOP_BREAK = re.compile(r"\b(while|for|break)\b")
+_IO_CALL_COUNT = re.compile(r"\b(write|send|recv|fwrite|fputs|fprintf|fs\.write|writeFileSync)\b", re.IGNORECASE)
+_BLOCK_EXEC = re.compile(r"\b(exec|system|popen|Runtime\.getRuntime|child_process\.)\b", re.IGNORECASE)
+_BLOCK_FORK = re.compile(r"\bfork\b|\bspawn\b", re.IGNORECASE)
+_BLOCK_ALLOC = re.compile(r"\bmalloc\b|\bcalloc\b|\bnew\s+[^\s]+\s*\[", re.IGNORECASE)
+
+# 매 호출 문자열 연결/재생성을 피하기 위한 사유 문자열 상수.
+# 규칙별 접두사+패턴 조합은 임포트 시 한 번만 만들어 같은 str 객체를 재사용한다.
+_MSG_NO_BREAK = "반복문에서 break/중단 키워드 미검출 — 잠재적 장시간 실행"
+_MSG_LARGE_ALLOC_SOFT = "메모리 할당 패턴 탐지 (잠재적 대량 할당)"
+_MSG_IO_IN_LOOP = "반복문 내부의 반복적 I/O 패턴(파일/네트워크) — 장시간 I/O 가능"
+_MSG_RECURSION = "재귀 호출 패턴 탐지 (탈출조건 미존재 가능성)"
+_IL_MSGS = ["무한루프(정적 패턴): " + p.pattern for p in INFINITE_LOOP_PATTERNS]
+_PT_MSGS = ["프로세스/스레드 생성 또는 외부명령 호출: " + p.pattern for p in PROCESS_THREAD_PATTERNS]
+_FW_MSGS = ["파일 쓰기/삭제/이동 패턴 탐지: " + p.pattern for p in FILE_WRITE_PATTERNS]
+TAG_NO_EXEC = "no-exec"
+TAG_NO_FORK = "no-fork"
+TAG_NO_LARGE_ALLOC = "no-large-alloc"
+
+def _loop_without_break(code: str) -> bool:
+    """while/for는 있는데 break가 없는지 1패스로 검사 (break 발견 즉시 중단).
+    loop 키워드/break 키워드를 각각 전체 스캔하던 것을 합친 버전."""
+    has_loop = False
+    for m in _LOOP_BREAK.finditer(code):
+        if m.group(1) == "break":
+            return False
+        has_loop = True
+    return has_loop
 
 def detect_infinite_loop(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
-    for p in INFINITE_LOOP_PATTERNS:
-        if re.search(p, code, flags=re.IGNORECASE):
-            score += 40
-            reasons.append("무한루프(정적 패턴): " + p)
-    if re.search(r"\bwhile\b|\bfor\b", code) and not re.search(r"\bbreak\b", code):
+    for idx in sorted(_INFINITE_LOOP_SCANNER.scan(code)):
+        score += 40
+        reasons.append(_IL_MSGS[idx])
+    if INFINITE_LOOP_PATTERNS[3].search(code):
+        score += 40
+        reasons.append(_IL_MSGS[3])
+    if _loop_without_break(code):
         score += 5
-        reasons.append("반복문에서 break/중단 키워드 미검출 — 잠재적 장시간 실행")
+        reasons.append(_MSG_NO_BREAK)
     return score, reasons
 
 def detect_large_alloc(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
     for p in LARGE_ALLOC_PATTERNS:
-        m = re.search(p, code, flags=re.IGNORECASE)
+        m = p.search(code)
         if m:
             digits = None
             for g in (m.groups() or []):
@@ -77,16 +133,24 @@ def detect_large_alloc(code: str) -> Tuple[int, List[str]]:
                 reasons.append(f"대규모 메모리 할당 탐지: {digits} 바이트 이상")
             else:
                 score += 10
-                reasons.append("메모리 할당 패턴 탐지 (잠재적 대량 할당)")
+                reasons.append(_MSG_LARGE_ALLOC_SOFT)
     return score, reasons
 
+# IO_IN_LOOP_SNIPPET의 어떤 매치라도 반드시 포함하는 토큰 (소문자 비교용)
+_IO_TOKENS = ("read", "write", "send", "recv", "fgets", "fscanf")
+
 def detect_io_in_loop(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
-    if re.search(IO_IN_LOOP_SNIPPET, code, flags=re.IGNORECASE):
+    # 값싼 프리체크: 루프 키워드 + I/O 토큰이 둘 다 있어야만 [\s\S]{0,600}?
+    # 스팬 패턴(백트래킹 비용이 큰)을 돌린다. 대부분의 입력은 여기서 걸러진다.
+    hay = code.lower()
+    if (("while" in hay or "for" in hay)
+            and any(t in hay for t in _IO_TOKENS)
+            and IO_IN_LOOP_SNIPPET.search(code)):
         score += 25
-        reasons.append("반복문 내부의 반복적 I/O 패턴(파일/네트워크) — 장시간 I/O 가능")
-    writes = len(re.findall(r"\b(write|send|recv|fwrite|fputs|fprintf|fs\.write|writeFileSync)\b", code, flags=re.IGNORECASE))
+        reasons.append(_MSG_IO_IN_LOOP)
+    writes = len(_IO_CALL_COUNT.findall(code))
     if writes >= 6:
         score += 10
         reasons.append(f"빈번한 I/O 호출 패턴 탐지 (count={writes})")
@@ -95,42 +159,53 @@ def detect_io_in_loop(code: str) -> Tuple[int, List[str]]:
 def detect_proc_thread_spawn(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
-    for p in PROCESS_THREAD_PATTERNS:
-        if re.search(p, code, flags=re.IGNORECASE):
-            score += 30
-            reasons.append("프로세스/스레드 생성 또는 외부명령 호출: " + p)
+    for idx in sorted(_PROC_THREAD_SCANNER.scan(code)):
+        score += 30
+        reasons.append(_PT_MSGS[idx])
     return score, reasons
 
 def detect_file_write_patterns(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
-    for p in FILE_WRITE_PATTERNS:
-        if re.search(p, code, flags=re.IGNORECASE):
-            score += 15
-            reasons.append("파일 쓰기/삭제/이동 패턴 탐지: " + p)
+    for idx in sorted(_FILE_WRITE_SCANNER.scan(code)):
+        score += 15
+        reasons.append(_FW_MSGS[idx])
     return score, reasons
 
 def detect_recursion(code: str) -> Tuple[int, List[str]]:
     score = 0
     reasons = []
-    if re.search(RECURSION_SNIPPET, code):
+    if RECURSION_SNIPPET.search(code):
         score += 20
-        reasons.append("재귀 호출 패턴 탐지 (탈출조건 미존재 가능성)")
+        reasons.append(_MSG_RECURSION)
     return score, reasons
 
-def run_all_resource_checks(code: str) -> Tuple[int, List[str], List[str]]:
+@functools.lru_cache(maxsize=1024)
+def _run_all_resource_checks_cached(code: str) -> Tuple[int, List[str], List[str]]:
+    # 규칙 전부를 alternation 하나로 융합했던 버전은 leftmost-match shadowing
+    # 때문에 겹치는 규칙의 히트를 잃었다 (예: pt6 Runtime...exec( 매치가 pt1의
+    # exec( 히트를 삼켜 점수가 반토막). 리스트별 RuleScanner 경로는 패턴마다
+    # 독립 검사라 가림이 없고, 리터럴 프리필터/hyperscan 가속은 그대로 누린다.
     total = 0
     reasons = []
     blocked = []
-    for f in (detect_infinite_loop, detect_large_alloc, detect_io_in_loop, detect_proc_thread_spawn, detect_file_write_patterns, detect_recursion):
+    for f in (detect_infinite_loop, detect_large_alloc, detect_io_in_loop,
+              detect_proc_thread_spawn, detect_file_write_patterns, detect_recursion):
         s, r = f(code)
         if s:
             total += s
             reasons.extend(r)
-    if re.search(r"\b(exec|system|popen|Runtime\.getRuntime|child_process\.)\b", code, flags=re.IGNORECASE):
-        blocked.append("no-exec")
-    if re.search(r"\bfork\b|\bspawn\b", code, flags=re.IGNORECASE):
-        blocked.append("no-fork")
-    if re.search(r"\bmalloc\b|\bcalloc\b|\bnew\s+[^\s]+\s*\[", code, flags=re.IGNORECASE):
-        blocked.append("no-large-alloc")
-    return max(0, min(100, total)), reasons, blocked
\ No newline at end of file
+    # blocked 태그는 전체 코드에 전용 패턴 3개를 무조건 돌린다 — 잘린 매치
+    # 텍스트 재검사는 경계(\b)를 날조하거나 다른 그룹에 가려진 히트를 놓친다.
+    if _BLOCK_EXEC.search(code):
+        blocked.append(TAG_NO_EXEC)
+    if _BLOCK_FORK.search(code):
+        blocked.append(TAG_NO_FORK)
+    if _BLOCK_ALLOC.search(code):
+        blocked.append(TAG_NO_LARGE_ALLOC)
+    return max(0, min(100, total)), reasons, blocked
+
+def run_all_resource_checks(code: str) -> Tuple[int, List[str], List[str]]:
+    # 순수 함수: 캐시 히트 시 리스트만 새로 복사해 반환
+    total, reasons, blocked = _run_all_resource_checks_cached(code)
+    return total, list(reasons), list(blocked)
@@ -0,0 +1,67 @@
+# app/detectors/rules_registry.py
+import re
+from typing import FrozenSet, List, NamedTuple, Optional
+
+from app.detectors.base import RuleScanner
+
+class Rule(NamedTuple):
+    pattern: str                 # 정규화된 소스 (대소문자 무시는 (?i:...)로 내장)
+    pts: int
+    msg: str
+    blocked_tag: Optional[str]
+    langs: FrozenSet[str]
+
+def _ci(src: str) -> str:
+    # 규칙별 IGNORECASE를 패턴에 내장해 서로 다른 플래그의 규칙을 한 DFA로 융합
+    return f"(?i:{src})"
+
+# 전 언어 금지 규칙의 단일 출처. 언어별 *_rules 모듈이 각자 들고 있던 테이블을
+# 합친 것 — 패턴이 겹치는 규칙(system/popen 등)은 컴파일을 공유하고 lang 태그로
+# 분기한다. 점수/메시지/차단 태그는 기존 모듈별 테이블 그대로.
+RULES: List[Rule] = [
+    # C
+    Rule(_ci(r"\bsystem\s*\("), 35, "system() 호출 (명령 실행)", None, frozenset({"c"})),
+    Rule(_ci(r"\bpopen\s*\("), 35, "popen() (명령 실행)", None, frozenset({"c"})),
+    Rule(_ci(r"\b(socket\s*\(|accept\s*\(|recv\s*\()"), 20, "네트워크/소켓 사용", None, frozenset({"c"})),
+    Rule(_ci(r"\bfork\s*\("), 40, "포크 위험", None, frozenset({"c"})),
+    Rule(_ci(r"\bexec(v|ve|vp|vpe)?\s*\("), 45, "exec 계열 호출", "no-system-call", frozenset({"c"})),
+    Rule(_ci(r"\bptrace\s*\("), 40, "프로세스 제어 위험", None, frozenset({"c"})),
+    # C++ (system/popen 패턴은 C와 컴파일 슬롯 공유)
+    Rule(_ci(r"\bsystem\s*\("), 35, "system() 호출", "no-system-call", frozenset({"cpp"})),
+    Rule(_ci(r"\bpopen\s*\("), 35, "popen() 호출", None, frozenset({"cpp"})),
+    Rule(_ci(r"\bstd::thread\b"), 12, "std::thread 사용 (스레드)", None, frozenset({"cpp"})),
+    Rule(_ci(r"\bmalloc\s*\("), 20, "malloc 호출", None, frozenset({"cpp"})),
+    # Java (대소문자 구분)
+    Rule(r"Runtime\.getRuntime\(\)\.exec\s*\(", 45, "Runtime.exec 호출", "no-exec", frozenset({"java"})),
+    Rule(r"new\s+ProcessBuilder\s*\(", 40, "ProcessBuilder 사용", "no-exec", frozenset({"java"})),
+    Rule(r"\bServerSocket\b", 30, "서버 소켓 (수신)", None, frozenset({"java"})),
+    Rule(r"\bThread\s*\(", 12, "Thread 사용 (스레드 생성)", None, frozenset({"java"})),
+    # 언어 불문 (generic)
+    Rule(r"\b(eval|exec)\b", 30, "동적 코드 실행", None, frozenset({"generic"})),
+    Rule(r"\b(fork|system\()\b", 25, "프로세스 제어", None, frozenset({"generic"})),
+]
+
+# 동일 패턴은 한 슬롯으로 묶는다: 슬롯 = 유니크 패턴, 슬롯별 규칙 리스트 유지
+_SLOT_OF: dict = {}
+_SLOT_PATTERNS: List[str] = []
+_SLOT_RULES: List[List[Rule]] = []
+for _rule in RULES:
+    _idx = _SLOT_OF.get(_rule.pattern)
+    if _idx is None:
+        _idx = _SLOT_OF[_rule.pattern] = len(_SLOT_PATTERNS)
+        _SLOT_PATTERNS.append(_rule.pattern)
+        _SLOT_RULES.append([])
+    _SLOT_RULES[_idx].append(_rule)
+
+# 모든 언어의 규칙을 하나의 멀티패턴 스캐너(DFA 1개)로 컴파일 — 모듈당
+# 따로 만들던 스캐너/DB를 공유해 컴파일 비용과 캐시 압력을 줄인다
+_MASTER_SCANNER = RuleScanner(_SLOT_PATTERNS)
+
+def scan_rules(code: str, lang: str) -> List[Rule]:
+    """한 번의 마스터 스캔 후 lang 태그가 일치하는 규칙만 돌려준다."""
+    return [
+        rule
+        for idx in sorted(_MASTER_SCANNER.scan(code))
+        for rule in _SLOT_RULES[idx]
+        if lang in rule.langs
+    ]
@@ -1,3 +1,6 @@
+import logging
+from typing import List
+
 from fastapi import FastAPI, HTTPException
 from app.schemas import AnalyzeRequest, AnalyzeResponse
 from app.detectors.lang_detect import detect_language
@@ -5,7 +8,7 @@ from app.detectors.python_rules import analyze_python
 from app.detectors.generic_rules import analyze_generic
 # Emoji/tagger imports
 from app.emoji.tagger import map_emojis
-from app.emoji.openai_tagger import get_openai_emojis_safe
+from app.emoji.openai_tagger import get_openai_emojis_safe, batch_get_openai_emojis
 from app.scoring import decision_logic, suggest_limits
 
 APP_VERSION = "mvp-0.1.0"
@@ -15,40 +18,14 @@ app = FastAPI(title="Malware & Emoji Tagging Service", version=APP_VERSION)
 def health():
     return {"ok": True, "version": APP_VERSION}
 
-@app.post("/v1/analyze", response_model=AnalyzeResponse)
-def analyze(req: AnalyzeRequest):
-    if not req.code or not req.code.strip():
-        raise HTTPException(400, "Empty code string")
-
+def _build_response(req: AnalyzeRequest, emoji_res: dict) -> AnalyzeResponse:
+    """정적 분석 + 의사결정 + 이모지 결과를 AnalyzeResponse로 조립."""
     # 언어 감지 및 정적 분석(언어별)
     lang = detect_language(req.code, req.language)
     result = analyze_python(req.code) if lang == "python" else analyze_generic(req.code)
 
-    # 이모지 태깅: OpenAI 시도 -> 실패 시 로컬 태거로 폴백
-    try:
-        emoji_res = get_openai_emojis_safe(req.code, local_fallback_callable=map_emojis)
-        # ensure fields exist
-        emoji_ids = emoji_res.get("emoji_ids", [])
-        emojis = emoji_res.get("emojis", [])
-        emoji_labels = emoji_res.get("emoji_labels", [])
-        fallback_used = bool(emoji_res.get("fallback_used", False))
-        openai_usage = emoji_res.get("openai_usage", None)
-        scores = emoji_res.get("scores", {}) if isinstance(emoji_res, dict) else {}
-    except Exception as e:
-        # 로깅은 서버 로그로 (uvicorn 터미널) 찍히게 하자
-        import logging
-        logging.exception("Emoji tagging failed, using local map_emojis fallback: %s", e)
-        local = map_emojis(req.code)
-        # local map_emojis returns {emojis, emoji_labels, tags} in original impl
-        emoji_ids = local.get("emoji_ids", []) or []
-        emojis = local.get("emojis", []) or local.get("emoji_ids", []) or []
-        emoji_labels = local.get("emoji_labels", []) or []
-        fallback_used = True
-        openai_usage = None
-        scores = {}
-
     # 의사결정 + suggested limits
-    decision, safe = decision_logic(result["score"])
+    decision, safe = decision_logic(result["score"], result.get("hard_block", False))
     limits = suggest_limits(result["score"], lang)
 
     # 반환: AnalyzeResponse 스키마에 맞춰 반환 (필드 이름은 schemas.py에 맞춰 조정)
@@ -56,17 +33,54 @@ def analyze(req: AnalyzeRequest):
         safe=safe,
         risk_score=result["score"],
         decision=decision,
-        language=lang, 
+        language=lang,
         blocked_rules=result.get("blocked", []),
         reasons=result.get("reasons", []),
         suggested_limits=limits,
-        emojis=emojis,
-        emoji_labels=emoji_labels,
-        emoji_ids=emoji_ids,          # 새로 추가된 필드: emoji_ids
+        emojis=emoji_res.get("emojis", []),
+        emoji_labels=emoji_res.get("emoji_labels", []),
+        emoji_ids=emoji_res.get("emoji_ids", []),
         tags=result.get("tags", []),
         style=result.get("style", {}),
-        scores=scores,
+        scores=emoji_res.get("scores", {}) if isinstance(emoji_res, dict) else {},
         version=APP_VERSION,
-        fallback_used=fallback_used,  # 새로 추가된 필드: fallback_used
-        openai_usage=openai_usage     # 새로 추가된 필드: openai_usage
+        fallback_used=bool(emoji_res.get("fallback_used", False)),
+        openai_usage=emoji_res.get("openai_usage", None),
     )
+
+@app.post("/v1/analyze", response_model=AnalyzeResponse)
+async def analyze(req: AnalyzeRequest):
+    if not req.code or not req.code.strip():
+        raise HTTPException(400, "Empty code string")
+
+    # 이모지 태깅: OpenAI 시도 -> 실패 시 로컬 태거로 폴백
+    try:
+        emoji_res = await get_openai_emojis_safe(req.code, local_fallback_callable=map_emojis)
+    except Exception as e:
+        # 로깅은 서버 로그로 (uvicorn 터미널) 찍히게 하자
+        logging.exception("Emoji tagging failed, using local map_emojis fallback: %s", e)
+        local = map_emojis(req.code)
+        # local map_emojis returns {emojis, emoji_labels, tags} in original impl
+        emoji_res = {
+            "emoji_ids": local.get("emoji_ids", []) or [],
+            "emojis": local.get("emojis", []) or local.get("emoji_ids", []) or [],
+            "emoji_labels": local.get("emoji_labels", []) or [],
+            "fallback_used": True,
+            "openai_usage": None,
+            "scores": {},
+        }
+
+    return _build_response(req, emoji_res)
+
+@app.post("/v1/analyze_batch", response_model=List[AnalyzeResponse])
+async def analyze_batch(reqs: List[AnalyzeRequest]):
+    if not reqs:
+        return []
+    for req in reqs:
+        if not req.code or not req.code.strip():
+            raise HTTPException(400, "Empty code string in batch")
+
+    # 이모지 태깅은 배치 1회 호출(캐시 히트는 API를 건너뜀), 정적 분석은 per-item
+    emoji_results = await batch_get_openai_emojis([r.code for r in reqs],
+                                                  local_fallback_callable=map_emojis)
+    return [_build_response(req, emo) for req, emo in zip(reqs, emoji_results)]
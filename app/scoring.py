@@ -1,15 +1,87 @@
-def decision_logic(score: int):
-    if score >= 70: return "block", False
-    if score >= 40: return "sandbox", False
-    return "allow", True
+# app/scoring.py
+
+# 선택적 가속: numpy가 있으면 배치 버전이 점수 배열을 한 번에 처리
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 점수→판정 테이블: 분기 2회 대신 배열 인덱싱 1회. 튜플 3개만 만들어
+# 공유하므로 테이블이 커도 메모리는 참조 101개가 전부다.
+_BLOCK = ("block", False)
+_SANDBOX = ("sandbox", False)
+_ALLOW = ("allow", True)
+_DECISION = tuple(
+    _BLOCK if s >= 70 else _SANDBOX if s >= 40 else _ALLOW for s in range(101)
+)
+
+def decision_logic(score: int, hard_block: bool = False):
+    """
+    Return (decision, safe)
+    - decision: "block" | "sandbox" | "allow"
+    - safe: boolean (True if allowed to run)
+    hard_block True => immediate block
+    """
+    if hard_block:
+        return _BLOCK
+    return _DECISION[score if 0 <= score <= 100 else max(0, min(100, score))]
+
+# 언어별 limits 스펙: (키, lo, hi). 정수 보간 lo + (hi-lo)*(100-score)//100
+# 의 상수를 아래 코드젠이 함수 소스에 구워 넣는다 — 실행 시 상수 조회나
+# float 연산 없이 LOAD_CONST만 남는 부분 평가.
+_PY_LIMIT_SPEC = (("cpu_time_sec", 1, 10), ("memory_mb", 64, 512),
+                  ("wall_time_sec", 2, 20), ("stdout_kb", 16, 256))
+
+def _compile_limits(spec):
+    """Generate and compile a limits function with the spec constants inlined."""
+    items = ", ".join(f"'{k}': {lo} + {hi - lo} * inv // 100" for k, lo, hi in spec)
+    src = ("def _limits(score):\n"
+           "    inv = 100 - min(max(score, 0), 100)\n"
+           f"    return {{{items}}}\n")
+    ns = {}
+    exec(compile(src, "<limits-codegen>", "exec"), ns)
+    return ns["_limits"]
+
+_python_limits = _compile_limits(_PY_LIMIT_SPEC)
+
+_NON_PY_DEFAULT = {"cpu_time_sec": 2, "memory_mb": 128, "wall_time_sec": 5, "stdout_kb": 64}
+
+def _default_limits(score: int):
+    # 호출자가 변형해도 안전하도록 사본 반환 (캐시 오염 방지 관례와 동일)
+    return dict(_NON_PY_DEFAULT)
+
+_LIMITS_BY_LANG = {"python": _python_limits}
 
 def suggest_limits(score: int, lang: str):
-    t = min(max(score / 100, 0), 1)
-    if lang == "python":
-        return {
-            "cpu_time_sec": int(1 + (10 - 1) * (1 - t)),
-            "memory_mb": int(64 + (512 - 64) * (1 - t)),
-            "wall_time_sec": int(2 + (20 - 2) * (1 - t)),
-            "stdout_kb": int(16 + (256 - 16) * (1 - t)),
-        }
-    return {"cpu_time_sec": 2, "memory_mb": 128, "wall_time_sec": 5, "stdout_kb": 64}
+    return _LIMITS_BY_LANG.get(lang, _default_limits)(score)
+
+# 판정 단계 인덱스((s>=40)+(s>=70))→공유 튜플
+_TIER = (_ALLOW, _SANDBOX, _BLOCK)
+
+def decision_logic_batch(scores, hard_blocks=None):
+    """
+    decision_logic over a list of scores in one pass.
+    numpy가 있으면 비교 2회를 배열 연산으로 처리하고, 없으면 스칼라 루프로
+    폴백한다. hard_blocks는 점수와 나란한 불리언 시퀀스(선택).
+    """
+    if hard_blocks is None:
+        if np is not None and scores:
+            s = np.clip(np.asarray(scores, dtype=np.int64), 0, 100)
+            tiers = ((s >= 40).view(np.int8) + (s >= 70).view(np.int8)).tolist()
+            return [_TIER[t] for t in tiers]
+        return [decision_logic(s) for s in scores]
+    return [decision_logic(s, hb) for s, hb in zip(scores, hard_blocks)]
+
+def suggest_limits_batch(scores, lang: str):
+    """suggest_limits over a list of scores for one language."""
+    if lang != "python":
+        return [dict(_NON_PY_DEFAULT) for _ in scores]
+    if np is None or not scores:
+        return [_python_limits(s) for s in scores]
+    inv = 100 - np.clip(np.asarray(scores, dtype=np.int64), 0, 100)
+    fields = zip((1 + 9 * inv // 100).tolist(), (64 + 448 * inv // 100).tolist(),
+                 (2 + 18 * inv // 100).tolist(), (16 + 240 * inv // 100).tolist())
+    return [
+        {"cpu_time_sec": c, "memory_mb": m, "wall_time_sec": w, "stdout_kb": o}
+        for c, m, w, o in fields
+    ]
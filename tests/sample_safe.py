@@ -2,10 +2,38 @@
 import math
 from typing import List
 
-def primes_upto(n: int) -> List[int]:
-    """Return primes up to n (simple sieve)."""
-    if n < 2:
-        return []
+# optional speedups, fastest available wins: numba JIT > numpy slices > pure Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def _sieve_njit(n):
+        s = np.ones(n + 1, dtype=np.uint8)
+        s[0] = s[1] = 0
+        i = 2
+        while i * i <= n:
+            if s[i]:
+                s[i * i::i] = 0
+            i += 1
+        return s
+
+def _primes_np(n: int) -> List[int]:
+    # slice-step assignment pushes the crossing-out loop into C
+    sieve = np.ones(n + 1, dtype=bool)
+    sieve[:2] = False
+    for i in range(2, int(n**0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = False
+    return np.flatnonzero(sieve).tolist()
+
+def _primes_py(n: int) -> List[int]:
     sieve = [True] * (n + 1)
     sieve[0:2] = [False, False]
     for i in range(2, int(n**0.5) + 1):
@@ -14,5 +42,15 @@ def primes_upto(n: int) -> List[int]:
                 sieve[j] = False
     return [i for i, v in enumerate(sieve) if v]
 
+def primes_upto(n: int) -> List[int]:
+    """Return primes up to n (simple sieve)."""
+    if n < 2:
+        return []
+    if np is not None:
+        if njit is not None:
+            return np.nonzero(_sieve_njit(n))[0].tolist()
+        return _primes_np(n)
+    return _primes_py(n)
+
 if __name__ == "__main__":
-    print("First 10 primes:", primes_upto(30))
\ No newline at end of file
+    print("First 10 primes:", primes_upto(30))